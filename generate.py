@@ -1,11 +1,45 @@
 import os
 import re
+import sys
 import time
 from dotenv import load_dotenv
-import google.generativeai as genai
-import http.server
-import socketserver
-import webbrowser
+
+# Everything clean_code() strips, as one alternation so the code is scanned once.
+# DOTALL is scoped to the comment branches so the line-comment branch stops at EOL.
+_RE_CLEAN = re.compile(
+    r"^```[a-zA-Z]*"        # opening fence: ```javascript, ```html
+    r"|```"                 # closing fence
+    r"|(?s:<!--.*?-->)"     # HTML comments
+    r"|(?s:/\*.*?\*/)"      # JS/CSS block comments
+    r"|^\s*//.*$",          # single-line JS comments
+    re.MULTILINE,
+)
+
+# [HTML] / [CSS] / [JS] section markers and the file each section is saved to
+_RE_SECTIONS = re.compile(r"\[(HTML|CSS|JS)\]")
+_SECTION_FILES = {"HTML": "index.html", "CSS": "styles.css", "JS": "app.js"}
+
+# References to the external files, dropped when CSS/JS are inlined
+_RE_ASSET_REFS = re.compile(
+    r"<link[^>]*href=[\"']\.?/?styles\.css[\"'][^>]*>|<script[^>]*src=[\"']\.?/?app\.js[\"'][^>]*>\s*</script>",
+    re.IGNORECASE,
+)
+
+# Where inlined CSS/JS are spliced in (tag names are case-insensitive in HTML).
+# Without </head>, the style goes after the first opening tag found, in this order.
+_RE_HEAD_END = re.compile(r"</head\s*>", re.IGNORECASE)
+_RE_STYLE_ANCHORS = (
+    re.compile(r"<head\b[^>]*>", re.IGNORECASE),
+    re.compile(r"<html\b[^>]*>", re.IGNORECASE),
+    re.compile(r"<!doctype[^>]*>", re.IGNORECASE),
+)
+_RE_SCRIPT_ANCHORS = (
+    re.compile(r"</body\s*>", re.IGNORECASE),
+    re.compile(r"</html\s*>", re.IGNORECASE),
+)
+
+# Pass --single-file to write one self-contained index.html (CSS/JS inlined)
+SINGLE_FILE = "--single-file" in sys.argv[1:]
 
 # -----------------------------
 # 1. Load API key
@@ -17,7 +51,6 @@ if not api_key:
     print("❌ Error: GEMINI_API_KEY not found in .env or environment variables.")
     exit()
 
-genai.configure(api_key=api_key)
 model_name = "gemini-2.0-flash"
 
 # -----------------------------
@@ -66,21 +99,30 @@ start_time = time.time()
 
 try:
     print("⏳ Generating website files...\n")
+    # Imported here so the SDK's load time doesn't delay the prompt
+    import google.generativeai as genai
+    from google.api_core import retry
+    genai.configure(api_key=api_key)
     model = genai.GenerativeModel(model_name)
 
-    for attempt in range(3):
-        try:
-            response = model.generate_content(meta_prompt)
-            break
-        except Exception as e:
-            print(f"⚠️ Attempt {attempt+1} failed: {e}")
-            if attempt < 2:
-                print("🔁 Retrying in 5 seconds...\n")
-                time.sleep(5)
-            else:
-                raise e
-
-    text = response.text or ""
+    # Transient errors (429/500/503) are retried by the SDK with exponential
+    # backoff and jitter instead of a fixed sleep between attempts
+    transient_retry = retry.Retry(
+        predicate=retry.if_transient_error,
+        initial=1.0,
+        multiplier=2.0,
+        maximum=10.0,
+        timeout=60.0,
+    )
+    # Stream the response so chunks are handled while the rest is still arriving
+    response = model.generate_content(meta_prompt, stream=True, request_options={"retry": transient_retry})
+    chunks = []
+    for chunk in response:
+        # e.g. a trailing chunk with only the finish reason or usage metadata has
+        # no parts; checking candidates first keeps .parts from raising on those
+        if chunk.candidates and chunk.parts:
+            chunks.append(chunk.text)
+    text = "".join(chunks)
 
     # -----------------------------
     # 5. Clean and save files in 'out/' folder
@@ -90,33 +132,61 @@ try:
 
     def clean_code(code: str) -> str:
         """Cleans markdown fences and removes comment lines."""
-        code = re.sub(r"^```[a-zA-Z]*", "", code, flags=re.MULTILINE)  # remove ```javascript, ```html
-        code = re.sub(r"```", "", code)                                # remove closing ```
-        code = re.sub(r"<!--.*?-->", "", code, flags=re.DOTALL)        # remove HTML comments
-        code = re.sub(r"/\*.*?\*/", "", code, flags=re.DOTALL)         # remove JS/CSS block comments
-        code = re.sub(r"^\s*//.*$", "", code, flags=re.MULTILINE)      # remove single-line JS comments
-        return code.strip()
-
-    if "[HTML]" in text:
-        html = text.split("[HTML]")[1].split("[CSS]")[0].strip() if "[CSS]" in text else text.split("[HTML]")[1].strip()
-        html = clean_code(html)
-        with open(os.path.join(output_dir, "index.html"), "w", encoding="utf-8") as f:
-            f.write(html)
-        print("💾 Saved: out/index.html")
-
-    if "[CSS]" in text:
-        css = text.split("[CSS]")[1].split("[JS]")[0].strip() if "[JS]" in text else text.split("[CSS]")[1].strip()
-        css = clean_code(css)
-        with open(os.path.join(output_dir, "styles.css"), "w", encoding="utf-8") as f:
-            f.write(css)
-        print("💾 Saved: out/styles.css")
-
-    if "[JS]" in text:
-        js = text.split("[JS]")[1].strip()
-        js = clean_code(js)
-        with open(os.path.join(output_dir, "app.js"), "w", encoding="utf-8") as f:
-            f.write(js)
-        print("💾 Saved: out/app.js")
+        return _RE_CLEAN.sub("", code).strip()
+
+    # Split the response in a single pass: [prefix, "HTML", body, "CSS", body, ...]
+    parts = _RE_SECTIONS.split(text)
+    sections = {}
+    for name, body in zip(parts[1::2], parts[2::2]):
+        sections.setdefault(name, body)
+
+    if SINGLE_FILE:
+        html = clean_code(sections.get("HTML", "").strip())
+        css = clean_code(sections.get("CSS", "").strip())
+        js = clean_code(sections.get("JS", "").strip())
+
+        html = _RE_ASSET_REFS.sub("", html)
+        style_tag = f"<style>\n{css}\n</style>\n" if css else ""
+        script_tag = f"<script>\n{js}\n</script>\n" if js else ""
+        # Locate each anchor tag once and splice by index; never ahead of the doctype
+        m = _RE_HEAD_END.search(html)
+        if m:
+            pos = m.start()
+        else:
+            m = next(filter(None, (r.search(html) for r in _RE_STYLE_ANCHORS)), None)
+            pos = m.end() if m else 0
+        html = html[:pos] + style_tag + html[pos:]
+
+        # Use the last closing tag, so a "</body>" inside inline script or a
+        # string earlier in the page doesn't split that script
+        m = None
+        for r in _RE_SCRIPT_ANCHORS:
+            for m in r.finditer(html):
+                pass
+            if m:
+                break
+        html = html[:m.start()] + script_tag + html[m.start():] if m else html + "\n" + script_tag
+
+        with open(os.path.join(output_dir, "index.html"), "wb") as f:
+            f.write(html.encode("utf-8"))
+        print("💾 Saved: out/index.html (CSS and JS inlined)")
+    else:
+        def save_file(filename: str, code: str):
+            with open(os.path.join(output_dir, filename), "wb") as f:
+                f.write(code.encode("utf-8"))
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Each file is written in the background while the next section is cleaned
+        with ThreadPoolExecutor(max_workers=len(_SECTION_FILES)) as pool:
+            pending = []
+            for name, filename in _SECTION_FILES.items():
+                if name in sections:
+                    code = clean_code(sections[name].strip())
+                    pending.append((filename, pool.submit(save_file, filename, code)))
+            for filename, future in pending:
+                future.result()  # re-raises any write error
+                print(f"💾 Saved: out/{filename}")
 
     elapsed = round(time.time() - start_time, 2)
     print(f"\n✅ Generation complete in {elapsed} seconds! Files saved in 'out/' folder.\n")
@@ -132,6 +202,10 @@ index_path = os.path.join(output_dir, "index.html")
 if not os.path.exists(index_path) or os.path.getsize(index_path) == 0:
     print("⚠️ No valid index.html found in 'out' folder. Generation might have failed.")
 else:
+    import http.server
+    import socketserver
+    import webbrowser
+
     os.chdir(output_dir)
     PORT = 8000
     print(f"\n🚀 Serving website from 'out/' folder at http://localhost:{PORT}")
@@ -11,11 +11,31 @@ and writes them into the ./out/ directory.
 """
 
 import os
+import shutil
 from pathlib import Path
 
 # Path to the output folder
 OUT_DIR = Path.cwd() / "out"
 
+# Fixed index.html boilerplate, pre-encoded once. The shared head/tail pieces
+# are used by both write_files() and write_single_file().
+_DOC_HEAD = b"""<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1" />
+  <title>LLM-generated site</title>
+"""
+_BODY_OPEN = b"""</head>
+<body>
+"""
+_DOC_TAIL = b"""</body>
+</html>"""
+
+# Around the generated markup in write_files()
+_INDEX_PREFIX = _DOC_HEAD + b'  <link rel="stylesheet" href="./styles.css" />\n' + _BODY_OPEN
+_INDEX_SUFFIX = b'\n\n<script src="./app.js" defer></script>\n' + _DOC_TAIL
+
 
 def ensure_out_dir():
     """
@@ -25,6 +45,21 @@ def ensure_out_dir():
     OUT_DIR.mkdir(exist_ok=True)
 
 
+def _write_bytes(path: Path, data: bytes):
+    """
+    Write raw bytes to path with plain os-level calls, bypassing the
+    buffered text I/O layers of open(). Truncates any existing file.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
 def write_files(html: str, css: str, js: str):
     """
     Write the generated HTML, CSS, and JS files into ./out directory.
@@ -37,35 +72,41 @@ def write_files(html: str, css: str, js: str):
     """
     ensure_out_dir()
 
-    # Construct the index.html file content
-    index_content = f"""<!doctype html>
-<html lang="en">
-<head>
-  <meta charset="utf-8" />
-  <meta name="viewport" content="width=device-width, initial-scale=1" />
-  <title>LLM-generated site</title>
-  <link rel="stylesheet" href="./styles.css" />
-</head>
-<body>
-{html}
+    # Encode every payload first, then write them out in one pass
+    outputs = {
+        "index.html": _INDEX_PREFIX + (html or "").encode("utf-8") + _INDEX_SUFFIX,
+        "styles.css": (css or "/* empty */").encode("utf-8"),
+        "app.js": (js or "// empty").encode("utf-8"),
+    }
+    for name, data in outputs.items():
+        _write_bytes(OUT_DIR / name, data)
 
-<script src="./app.js" defer></script>
-</body>
-</html>"""
+    print(f"[+] Files written successfully in: {OUT_DIR}")
 
-    # Write index.html
-    with open(OUT_DIR / "index.html", "w", encoding="utf-8") as f:
-        f.write(index_content)
 
-    # Write styles.css
-    with open(OUT_DIR / "styles.css", "w", encoding="utf-8") as f:
-        f.write(css or "/* empty */")
+def write_single_file(html: str, css: str, js: str):
+    """
+    Write the generated site as one self-contained ./out/index.html,
+    with the CSS and JS inlined instead of saved as separate files.
+
+    Args:
+        html (str): HTML markup from LLM output
+        css (str): CSS styles from LLM output
+        js (str): JavaScript code from LLM output
+    """
+    ensure_out_dir()
 
-    # Write app.js
-    with open(OUT_DIR / "app.js", "w", encoding="utf-8") as f:
-        f.write(js or "// empty")
+    index_bytes = b"".join((
+        _DOC_HEAD,
+        b"  <style>\n", (css or "/* empty */").encode("utf-8"), b"\n  </style>\n",
+        _BODY_OPEN,
+        (html or "").encode("utf-8"),
+        b"\n\n<script>\n", (js or "// empty").encode("utf-8"), b"\n</script>\n",
+        _DOC_TAIL,
+    ))
+    _write_bytes(OUT_DIR / "index.html", index_bytes)
 
-    print(f"[+] Files written successfully in: {OUT_DIR}")
+    print(f"[+] Single-file site written successfully in: {OUT_DIR}")
 
 
 def clear_out_dir():
@@ -73,9 +114,18 @@ def clear_out_dir():
     Optional helper: clears old files from the ./out directory
     before writing new ones.
     """
-    if OUT_DIR.exists():
-        for file in OUT_DIR.iterdir():
-            try:
-                file.unlink()
-            except Exception:
-                pass
+    if OUT_DIR.is_symlink():
+        # rmtree refuses symlinks; clear the linked directory's files instead
+        if OUT_DIR.exists():
+            for file in OUT_DIR.iterdir():
+                try:
+                    file.unlink()
+                except Exception:
+                    pass
+        return
+
+    try:
+        shutil.rmtree(OUT_DIR)
+    except FileNotFoundError:
+        pass
+    ensure_out_dir()
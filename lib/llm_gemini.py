@@ -8,12 +8,57 @@ sending a single 'user' part containing both the instruction and the prompt.
 """
 
 import os
+import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional
 
+from .utils import load_env
+
+try:
+    # orjson is optional; if installed, use it for faster JSON encode/decode
+    import orjson
+except Exception:
+    orjson = None
+
 # Base Gemini REST endpoint (v1beta)
 BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
 
+# API key resolved once at import; see refresh_key(). .env is loaded here
+# explicitly because lib/__init__.py imports this module before utils.
+load_env()
+_API_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
+
+# Retry transient failures with exponential backoff, honouring Retry-After.
+# POST is not retried by default, so it is allowed explicitly; read errors
+# and timeouts are not retried (read=0) so a slow generation is neither
+# re-billed nor left blocking for several timeouts. The final response is
+# returned (not raised) so call_gemini can report the error body.
+_RETRIES = Retry(
+    total=3,
+    read=0,
+    backoff_factor=1.0,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"POST"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+# Shared session so repeated calls reuse the same TCP/TLS connection
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=_RETRIES))
+
+
+def refresh_key() -> Optional[str]:
+    """
+    Re-read the API key from the environment, e.g. after it was changed
+    at runtime or in tests. Returns the new key (or None).
+    """
+    global _API_KEY
+    _API_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
+    return _API_KEY
+
 
 def call_gemini(prompt: str, model: str = "gemini-2.5-flash") -> str:
     """
@@ -26,8 +71,8 @@ def call_gemini(prompt: str, model: str = "gemini-2.5-flash") -> str:
     Returns:
         str: The text response from Gemini (ideally JSON).
     """
-    # Load API key
-    key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
+    # Use the cached API key; re-check the environment only if it was missing
+    key = _API_KEY or refresh_key()
     if not key:
         raise RuntimeError("❌ Missing GEMINI_API_KEY. Add it in your .env file.")
 
@@ -60,61 +105,74 @@ def call_gemini(prompt: str, model: str = "gemini-2.5-flash") -> str:
         "x-goog-api-key": key
     }
 
-    resp = requests.post(url, json=body, headers=headers, timeout=60)
+    # Serialize ourselves (Content-Type is already set in headers); both paths
+    # produce compact UTF-8 without \uXXXX escaping of non-ASCII prompt text
+    if orjson is not None:
+        data = orjson.dumps(body)
+    else:
+        data = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    resp = _SESSION.post(url, data=data, headers=headers, timeout=60)
     if not resp.ok:
         # Raise detailed error so caller can see server reply
         raise RuntimeError(f"Gemini API Error {resp.status_code}: {resp.text}")
 
     # Parse JSON safely
     try:
-        data = resp.json()
+        data = None
+        if orjson is not None:
+            try:
+                data = orjson.loads(resp.content)
+            except orjson.JSONDecodeError:
+                pass  # stricter than the stdlib (e.g. unpaired surrogates); retry below
+        if data is None:
+            data = resp.json()
     except Exception:
         # If response is not JSON, return raw text
         return resp.text
 
     # --- Extract text field from Gemini response ---
     # Responses vary; try a few common paths then fallback to the first string found.
-    possible_paths = [
-        # candidate -> content -> text
-        (lambda d: d.get("candidates", [{}])[0].get("content", [{}])[0].get("text") if d.get("candidates") else None),
-        # outputs -> content -> text
-        (lambda d: d.get("outputs", [{}])[0].get("content", [{}])[0].get("text") if d.get("outputs") else None),
-        # output -> content -> text
-        (lambda d: d.get("output", [{}])[0].get("content", [{}])[0].get("text") if d.get("output") else None),
-        # sometimes content is nested differently
-        (lambda d: (d.get("candidates") or [{}])[0].get("content") if isinstance((d.get("candidates") or [{}])[0].get("content"), str) else None),
-    ]
-
-    for fn in possible_paths:
+    if isinstance(data, dict):
+        # candidates -> content -> parts -> text (standard generateContent shape)
         try:
-            p = fn(data)
-            if p:
-                return p
-        except Exception:
-            continue
-
-    # Fallback: find first text-like string in JSON recursively
-    def find_text(obj) -> Optional[str]:
-        if obj is None:
-            return None
-        if isinstance(obj, str):
-            return obj
-        if isinstance(obj, list):
-            for i in obj:
-                t = find_text(i)
-                if t:
-                    return t
-        if isinstance(obj, dict):
-            # prefer keys likely to contain text
-            for k in ("text", "content", "message", "output", "parts"):
-                if k in obj:
-                    t = find_text(obj[k])
-                    if t:
-                        return t
-            for v in obj.values():
-                t = find_text(v)
+            t = data["candidates"][0]["content"]["parts"][0]["text"]
+            if t:
+                return t
+        except (KeyError, IndexError, TypeError):
+            pass
+
+        # candidates / outputs / output -> content -> text
+        for key in ("candidates", "outputs", "output"):
+            try:
+                t = data[key][0]["content"][0]["text"]
                 if t:
                     return t
+            except (KeyError, IndexError, TypeError):
+                pass
+
+        # sometimes content is a plain string
+        try:
+            t = data["candidates"][0]["content"]
+            if isinstance(t, str) and t:
+                return t
+        except (KeyError, IndexError, TypeError):
+            pass
+
+    # Fallback: find first text-like string in JSON (depth-first, iterative)
+    def find_text(obj) -> Optional[str]:
+        stack = [obj]
+        while stack:
+            cur = stack.pop()
+            if isinstance(cur, str):
+                if cur:
+                    return cur
+            elif isinstance(cur, list):
+                stack.extend(reversed(cur))
+            elif isinstance(cur, dict):
+                # visit keys likely to contain text first ("text" is pushed last)
+                stack.extend(reversed(list(cur.values())))
+                stack.extend(cur[k] for k in ("parts", "output", "message", "content", "text") if k in cur)
         return None
 
     text = find_text(data)
@@ -19,6 +19,31 @@ from typing import Dict, Optional
 import json
 import re
 
+try:
+    # orjson is optional; if installed, use it for faster JSON encode/decode
+    import orjson
+except Exception:
+    orjson = None
+
+# Patterns compiled once at import time and reused across parse calls
+_RE_JSON_BLOCK = re.compile(r"\{[\s\S]*\}")
+_RE_STYLE = re.compile(r"<style[^>]*>([\s\S]*?)</style>", re.IGNORECASE)
+_RE_SCRIPT_NO_SRC = re.compile(r"<script\b(?:(?!src)[\s\S])*?>([\s\S]*?)</script>", re.IGNORECASE)
+_RE_SCRIPT_ANY = re.compile(r"<script[^>]*>([\s\S]*?)</script>", re.IGNORECASE)
+_RE_BODY = re.compile(r"<body[^>]*>([\s\S]*?)</body>", re.IGNORECASE)
+_RE_HEAD = re.compile(r"<head[\s\S]*?>[\s\S]*?</head>", re.IGNORECASE)
+_RE_BLOCK_EL = re.compile(r"<(div|main|section|article)[\s\S]*?>[\s\S]*?</\1>", re.IGNORECASE)
+
+
+def _json_loads(text: str):
+    """Decode JSON with orjson when available, else the stdlib json module."""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # e.g. unpaired surrogate escapes or NaN; the stdlib accepts these
+    return json.loads(text)
+
 
 def _extract_first_json_block(text: str) -> Optional[str]:
     """
@@ -28,11 +53,16 @@ def _extract_first_json_block(text: str) -> Optional[str]:
     if not text:
         return None
     # Remove common markdown fences (```json ... ```)
-    text = re.sub(r"^```(?:json)?\s*", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"\s*```$", "", text, flags=re.IGNORECASE)
+    text = text.strip()
+    if text[:7].lower() == "```json":
+        text = text[7:]
+    elif text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
 
     # Find first balanced-looking JSON object using a regex (best-effort)
-    m = re.search(r"\{[\s\S]*\}", text)
+    m = _RE_JSON_BLOCK.search(text)
     return m.group(0) if m else None
 
 
@@ -46,22 +76,22 @@ def _extract_html_parts(text: str) -> Dict[str, str]:
     js = ""
 
     # Extract <style> contents
-    style_m = re.search(r"<style[^>]*>([\s\S]*?)</style>", text, flags=re.IGNORECASE)
+    style_m = _RE_STYLE.search(text)
     if style_m:
         css = style_m.group(1).strip()
 
     # Extract first <script> contents that is not a src include
-    script_m = re.search(r"<script\b(?:(?!src)[\s\S])*?>([\s\S]*?)</script>", text, flags=re.IGNORECASE)
+    script_m = _RE_SCRIPT_NO_SRC.search(text)
     if script_m:
         js = script_m.group(1).strip()
     else:
         # fallback: any <script> content
-        script_m2 = re.search(r"<script[^>]*>([\s\S]*?)</script>", text, flags=re.IGNORECASE)
+        script_m2 = _RE_SCRIPT_ANY.search(text)
         if script_m2:
             js = script_m2.group(1).strip()
 
     # Extract <body> inner HTML (preferred)
-    body_m = re.search(r"<body[^>]*>([\s\S]*?)</body>", text, flags=re.IGNORECASE)
+    body_m = _RE_BODY.search(text)
     if body_m:
         html = body_m.group(1).strip()
     else:
@@ -69,11 +99,11 @@ def _extract_html_parts(text: str) -> Dict[str, str]:
         if "<html" in text.lower():
             # remove any <head> (we keep body-like content)
             # simple approach: remove <head>...</head>
-            no_head = re.sub(r"<head[\s\S]*?>[\s\S]*?</head>", "", text, flags=re.IGNORECASE)
+            no_head = _RE_HEAD.sub("", text)
             html = no_head.strip()
         else:
             # Try to extract the first large block-level element like <div>...</div>
-            div_m = re.search(r"<(div|main|section|article)[\s\S]*?>[\s\S]*?</\1>", text, flags=re.IGNORECASE)
+            div_m = _RE_BLOCK_EL.search(text)
             if div_m:
                 html = div_m.group(0).strip()
 
@@ -90,7 +120,7 @@ def parse_model_output(text: str) -> Dict[str, str]:
 
     # 1) Try direct JSON parse
     try:
-        obj = json.loads(text)
+        obj = _json_loads(text)
         if isinstance(obj, dict) and any(k in obj for k in ("html", "css", "js")):
             return {
                 "html": obj.get("html", "") or "",
@@ -104,7 +134,7 @@ def parse_model_output(text: str) -> Dict[str, str]:
     block = _extract_first_json_block(text)
     if block:
         try:
-            obj = json.loads(block)
+            obj = _json_loads(block)
             if isinstance(obj, dict) and any(k in obj for k in ("html", "css", "js")):
                 return {
                     "html": obj.get("html", "") or "",
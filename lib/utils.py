@@ -21,6 +21,12 @@ try:
 except Exception:
     _load_dotenv = None
 
+try:
+    # orjson is optional; if installed, use it for faster JSON encode/decode
+    import orjson
+except Exception:
+    orjson = None
+
 
 def load_env(dotenv_path: str = ".env"):
     """
@@ -68,6 +74,11 @@ def pretty_json(obj) -> str:
     Return a pretty-printed JSON string for objects (dict/list).
     Falls back to str(obj) for non-serializable objects.
     """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except Exception:
+            pass  # e.g. non-string dict keys; let the stdlib encoder try
     try:
         return json.dumps(obj, indent=2, ensure_ascii=False)
     except Exception: